@@ -7,9 +7,12 @@ A lightweight system monitoring tool that collects metrics and monitors log file
 import psutil
 import time
 import json
+import math
 from datetime import datetime
 import threading
+import queue
 from collections import deque
+from array import array
 import os
 from watchdog.observers import Observer
 from watchdog.events import FileSystemEventHandler
@@ -19,47 +22,304 @@ import logging
 
 # Flask imports
 from flask import Flask, jsonify, request
+from flask.json.provider import JSONProvider
 from flask_cors import CORS
+import orjson
+from waitress import serve
+
+
+# Canonical log levels, in the order they are reported in log statistics
+_LEVELS = ('ERROR', 'WARNING', 'INFO', 'DEBUG', 'UNKNOWN')
+_LEVEL_INDEX = {level: i for i, level in enumerate(_LEVELS)}
+
+# Canonical level for each bracketed token, e.g. "[WARN]" -> WARNING
+_LEVEL_MAP = {
+    'ERROR': 'ERROR', 'CRITICAL': 'ERROR', 'FATAL': 'ERROR',
+    'WARN': 'WARNING', 'WARNING': 'WARNING',
+    'INFO': 'INFO', 'INFORMATION': 'INFO',
+    'DEBUG': 'DEBUG', 'TRACE': 'DEBUG'
+}
+
+# Substrings that every level the regex can match contains (uppercased)
+_LEVEL_TOKENS = ('ERROR', 'WARN', 'INFO', 'DEBUG', 'CRITICAL', 'FATAL', 'TRACE')
+
+# Common log level patterns; the named group that matches is the canonical level
+_LEVEL_RE = re.compile(
+    r'\[?(?P<ERROR>ERROR|CRITICAL|FATAL)\]?'
+    r'|\[?(?P<WARNING>WARN|WARNING)\]?'
+    r'|\[?(?P<INFO>INFO|INFORMATION)\]?'
+    r'|\[?(?P<DEBUG>DEBUG|TRACE)\]?',
+    re.IGNORECASE
+)
 
 
 class LogFileHandler(FileSystemEventHandler):
     """Handles log file changes and processes new log entries"""
     
-    def __init__(self, log_collector):
+    READ_BUFFER_SIZE = 65536
+    
+    # Windows won't let the writer rename or delete a file we hold open, which
+    # breaks rotation, so there handles are closed after each read instead
+    KEEP_FILES_OPEN = os.name != 'nt'
+    
+    def __init__(self, log_collector, debounce_interval=0.05):
         self.log_collector = log_collector
-        self.file_positions = {}  # Track file read positions
+        self.file_handles = {}  # Open handle per log file, positioned at last read
+        self.file_positions = {}  # (inode, offset) per log file closed between reads
+        self.partial_lines = {}  # Unterminated trailing line per log file
+        self.watched_paths = set()  # Known .log files under monitored directories
+        self._basenames = {}  # Cached os.path.basename per log file
+        
+        # Reusable read buffers, so bursts of events don't allocate per read
+        self._buffer_pool = queue.LifoQueue()
+        for _ in range(4):
+            self._buffer_pool.put(bytearray(self.READ_BUFFER_SIZE))
+        
+        # Modify events are coalesced and drained once per debounce window
+        self.debounce_interval = debounce_interval
+        self._pending = set()
+        self._pending_lock = threading.Lock()
+        self._process_lock = threading.Lock()
+        self._flush_timer = None
     
     def on_modified(self, event):
         """Called when a file is modified"""
-        if not event.is_directory and event.src_path.endswith('.log'):
-            self.process_log_file(event.src_path)
+        file_path = event.src_path
+        if file_path not in self.watched_paths:
+            # First event for a file created after monitoring started
+            if event.is_directory or not file_path.endswith('.log'):
+                return
+            self.watched_paths.add(file_path)
+        
+        with self._pending_lock:
+            self._pending.add(file_path)
+            if self._flush_timer is None:
+                self._flush_timer = threading.Timer(
+                    self.debounce_interval, self.flush_pending
+                )
+                self._flush_timer.daemon = True
+                self._flush_timer.start()
+    
+    def on_deleted(self, event):
+        """Called when a file is deleted"""
+        if not event.is_directory:
+            self.forget_file(event.src_path)
+    
+    def on_moved(self, event):
+        """Called when a file is moved or renamed (e.g. rotated away)"""
+        if not event.is_directory:
+            self.forget_file(event.src_path)
+    
+    def flush_pending(self):
+        """Process every log file modified since the last flush"""
+        with self._pending_lock:
+            pending = self._pending
+            self._pending = set()
+            self._flush_timer = None
+        
+        with self._process_lock:
+            for file_path in pending:
+                self.process_log_file(file_path)
+    
+    def get_file_handle(self, file_path):
+        """Get the open handle for a log file, reopening it after rotation"""
+        stat = os.stat(file_path)
+        f = self.file_handles.get(file_path)
+        
+        if f is not None:
+            inode, offset = os.fstat(f.fileno()).st_ino, f.tell()
+        else:
+            inode, offset = self.file_positions.pop(file_path, (None, 0))
+        
+        if inode is not None and inode != stat.st_ino:
+            # File was rotated - start reading the new file from the top
+            if f is not None:
+                f.close()
+                f = None
+            offset = 0
+            self.partial_lines.pop(file_path, None)
+        elif stat.st_size < offset:
+            # File was truncated in place
+            offset = 0
+            if f is not None:
+                f.seek(0)
+            self.partial_lines.pop(file_path, None)
+        
+        if f is None:
+            f = open(file_path, 'rb', buffering=0)
+            if offset:
+                f.seek(offset)
+            self.file_handles[file_path] = f
+        
+        return f
+    
+    def release_file_handle(self, file_path):
+        """Close a log file's handle, remembering where the next read resumes"""
+        f = self.file_handles.pop(file_path, None)
+        if f is not None:
+            self.file_positions[file_path] = (os.fstat(f.fileno()).st_ino, f.tell())
+            f.close()
+    
+    def forget_file(self, file_path):
+        """Close and drop everything kept for a log file that no longer exists"""
+        with self._process_lock:
+            self._forget_file(file_path)
+    
+    def _forget_file(self, file_path):
+        """forget_file for callers already holding _process_lock"""
+        f = self.file_handles.pop(file_path, None)
+        if f is not None:
+            f.close()  # Lets the filesystem reclaim a deleted file's space
+        self.file_positions.pop(file_path, None)
+        self.partial_lines.pop(file_path, None)
+        self._basenames.pop(file_path, None)
+        self.watched_paths.discard(file_path)
     
     def process_log_file(self, file_path):
         """Process new lines in log file"""
         try:
-            # Get current file size
-            current_size = os.path.getsize(file_path)
+            f = self.get_file_handle(file_path)
+            buf = self._acquire_buffer()
+            view = memoryview(buf)
+            
+            # Complete the line left unterminated by the previous read
+            partial = self.partial_lines.pop(file_path, b'')
             
-            # Get last known position
-            last_position = self.file_positions.get(file_path, 0)
+            basename = self._basenames.get(file_path)
+            if basename is None:
+                basename = self._basenames[file_path] = os.path.basename(file_path)
             
-            if current_size > last_position:
-                # Read new content
-                with open(file_path, 'r', encoding='utf-8') as f:
-                    f.seek(last_position)
-                    new_lines = f.readlines()
+            try:
+                # Read everything appended since the last event, a buffer at a time
+                while True:
+                    size = f.readinto(buf)
+                    if not size:
+                        break
+                    
+                    data = partial + view[:size]
+                    
+                    # Decode complete lines only; keep a trailing fragment for next time
+                    lines = data.splitlines()
+                    partial = b'' if data.endswith((b'\n', b'\r')) else lines.pop()
                     
                     # Process each new line
-                    for line in new_lines:
+                    for line in lines:
                         line = line.strip()
                         if line:  # Skip empty lines
-                            self.log_collector.add_log_entry(file_path, line)
-                
-                # Update position
-                self.file_positions[file_path] = current_size
+                            self.log_collector.add_log_entry(
+                                file_path, line.decode('utf-8', 'replace'), basename
+                            )
+            finally:
+                view.release()
+                self._buffer_pool.put(buf)
+                if partial:
+                    self.partial_lines[file_path] = partial
+                if not self.KEEP_FILES_OPEN:
+                    self.release_file_handle(file_path)
                 
+        except FileNotFoundError:
+            # Deleted since the event fired - don't keep its handle open forever
+            self._forget_file(file_path)
         except Exception as e:
             logging.error(f"Error processing log file {file_path}: {e}")
+    
+    def _acquire_buffer(self):
+        """Take a read buffer from the pool, allocating one if it is empty"""
+        try:
+            return self._buffer_pool.get_nowait()
+        except queue.Empty:
+            return bytearray(self.READ_BUFFER_SIZE)
+    
+    def close(self):
+        """Close all open log file handles"""
+        with self._pending_lock:
+            if self._flush_timer is not None:
+                self._flush_timer.cancel()
+                self._flush_timer = None
+            self._pending.clear()
+        
+        with self._process_lock:
+            for f in self.file_handles.values():
+                f.close()
+            self.file_handles.clear()
+            self.file_positions.clear()
+            self.partial_lines.clear()
+
+
+class RingBuffer:
+    """Fixed-size ring buffer with O(limit) access to the newest items"""
+    
+    def __init__(self, max_items):
+        if max_items < 0:
+            raise ValueError(f"max_items must not be negative, got {max_items}")
+        
+        self.max_items = max_items
+        self._items = [None] * max_items
+        self._head = 0  # Next slot to overwrite
+        self._count = 0
+    
+    def __len__(self):
+        return self._count
+    
+    def append(self, item):
+        """Add an item, returning the oldest one it overwrote (None while not full)"""
+        if not self.max_items:
+            return None  # Like deque(maxlen=0): keep nothing
+        
+        evicted = self._items[self._head] if self._count == self.max_items else None
+        self._items[self._head] = item
+        self._head = (self._head + 1) % self.max_items
+        if self._count < self.max_items:
+            self._count += 1
+        return evicted
+    
+    def popleft(self):
+        """Remove and return the oldest item"""
+        if not self._count:
+            raise IndexError('pop from an empty RingBuffer')
+        
+        index = (self._head - self._count) % self.max_items
+        item = self._items[index]
+        self._items[index] = None
+        self._count -= 1
+        return item
+    
+    def tail(self, limit=None):
+        """Get the newest items (all of them without a limit), oldest first"""
+        count = self._count
+        if limit and 0 < limit < count:
+            count = limit
+        if not count:
+            return []
+        
+        # Slice up to the head, wrapping around the end of the list if needed
+        start = self._head - count
+        if start >= 0:
+            return self._items[start:self._head]
+        return self._items[start:] + self._items[:self._head]
+
+
+class LogEntry:
+    """A single collected log line (compact fixed-layout record)"""
+    
+    __slots__ = ('timestamp', 'file', 'full_path', 'message', 'level')
+    
+    def __init__(self, timestamp, file, full_path, message, level):
+        self.timestamp = timestamp
+        self.file = file
+        self.full_path = full_path
+        self.message = message
+        self.level = level
+    
+    def to_dict(self):
+        """Convert to a JSON-serializable dict"""
+        return {
+            'timestamp': self.timestamp,
+            'file': self.file,
+            'full_path': self.full_path,
+            'message': self.message,
+            'level': self.level
+        }
 
 
 class LogCollector:
@@ -67,85 +327,185 @@ class LogCollector:
     
     def __init__(self, max_entries=200):
         self.max_entries = max_entries
-        self.log_entries = deque(maxlen=max_entries)
-        self.log_stats = {
-            'total_entries': 0,
-            'error_count': 0,
-            'warning_count': 0,
-            'info_count': 0,
-            'debug_count': 0,
-            'unknown_count': 0
+        self.log_entries = RingBuffer(max_entries)
+        # Per-level views of the entries in log_entries so level filtering skips
+        # the scan; an entry leaves its view when log_entries evicts it
+        self._by_level = {
+            level: RingBuffer(max_entries)
+            for level in _LEVELS
         }
+        self.total_entries = 0
+        self.level_counts = [0] * len(_LEVELS)  # Indexed via _LEVEL_INDEX
         self.lock = threading.Lock()  # Thread safety for API access
+        self._timestamp_cache = (None, '')  # (epoch second, formatted prefix)
     
-    def add_log_entry(self, file_path, line):
-        """Add a new log entry"""
-        entry = {
-            'timestamp': datetime.now().isoformat(),
-            'file': os.path.basename(file_path),
-            'full_path': file_path,
-            'message': line,
-            'level': self.extract_log_level(line)
-        }
+    def add_log_entry(self, file_path, line, basename=None):
+        """Add a new log entry (basename may be passed in to skip recomputing it)"""
+        entry = LogEntry(
+            timestamp=self.current_timestamp(),
+            file=basename or os.path.basename(file_path),
+            full_path=file_path,
+            message=line,
+            level=self.extract_log_level(line)
+        )
+        
+        level_index = _LEVEL_INDEX[entry.level]
+        level_entries = self._by_level[entry.level]
         
         with self.lock:
-            self.log_entries.append(entry)
-            self.log_stats['total_entries'] += 1
-            
-            # Update level counts
-            level = entry['level'].lower()
-            count_key = f'{level}_count'
-            if count_key in self.log_stats:
-                self.log_stats[count_key] += 1
+            evicted = self.log_entries.append(entry)
+            if evicted is not None:
+                # The evicted entry is the oldest overall, so also the oldest of its level
+                self._by_level[evicted.level].popleft()
+            level_entries.append(entry)
+            self.total_entries += 1
+            self.level_counts[level_index] += 1
         
-        # Display new log entry
-        print(f"📝 [{entry['level']}] {entry['file']}: {line}")
+        # Display new log entry (formatted lazily, only when DEBUG is enabled)
+        logging.debug("📝 [%s] %s: %s", entry.level, entry.file, line)
+    
+    def current_timestamp(self):
+        """Get the local time in ISO format, formatting the date part once per second"""
+        now = time.time()
+        second = int(now)
+        
+        # Swapped as one tuple so concurrent producers never see a torn cache
+        cached_second, prefix = self._timestamp_cache
+        if second != cached_second:
+            prefix = time.strftime('%Y-%m-%dT%H:%M:%S', time.localtime(second))
+            self._timestamp_cache = (second, prefix)
+        
+        return f"{prefix}.{int((now - second) * 1_000_000):06d}"
     
     def extract_log_level(self, log_line):
         """Extract log level from log line"""
-        # Common log level patterns
-        patterns = [
-            r'\[?(ERROR|CRITICAL|FATAL)\]?',
-            r'\[?(WARN|WARNING)\]?',
-            r'\[?(INFO|INFORMATION)\]?',
-            r'\[?(DEBUG|TRACE)\]?'
-        ]
-        
-        for pattern in patterns:
-            match = re.search(pattern, log_line, re.IGNORECASE)
-            if match:
-                level = match.group(1).upper()
-                if level in ['WARN', 'WARNING']:
-                    return 'WARNING'
-                elif level in ['INFO', 'INFORMATION']:
-                    return 'INFO'
-                elif level in ['ERROR', 'CRITICAL', 'FATAL']:
-                    return 'ERROR'
-                elif level in ['DEBUG', 'TRACE']:
-                    return 'DEBUG'
+        # Fast path: most lines carry the level as the first "[LEVEL]" token
+        start = log_line.find('[')
+        if start != -1:
+            end = log_line.find(']', start + 1, start + 16)
+            if end != -1:
+                level = _LEVEL_MAP.get(log_line[start + 1:end].upper())
+                if level:
+                    return level
+        
+        # Cheap screen: lines without any level keyword can't match the regex
+        upper_line = log_line.upper()
+        if not any(token in upper_line for token in _LEVEL_TOKENS):
+            return 'UNKNOWN'
+        
+        match = _LEVEL_RE.search(log_line)
+        if match:
+            return match.lastgroup
         
         return 'UNKNOWN'
     
     def get_recent_logs(self, limit=10, level_filter=None):
         """Get recent log entries with optional filtering"""
-        with self.lock:
-            logs = list(self.log_entries)
-        
         # Apply level filter if specified
         if level_filter:
-            level_filter = level_filter.upper()
-            logs = [log for log in logs if log['level'] == level_filter]
+            entries = self._by_level.get(level_filter.upper())
+            if entries is None:
+                return []
+        else:
+            entries = self.log_entries
         
-        # Apply limit
-        if limit:
-            logs = logs[-limit:]
+        # Apply limit by slicing only the newest entries
+        with self.lock:
+            logs = entries.tail(limit)
             
-        return logs
+        return [log.to_dict() for log in logs]
     
     def get_log_stats(self):
         """Get log statistics"""
         with self.lock:
-            return self.log_stats.copy()
+            total_entries = self.total_entries
+            level_counts = list(self.level_counts)
+        
+        stats = {'total_entries': total_entries}
+        for level, count in zip(_LEVELS, level_counts):
+            stats[f'{level.lower()}_count'] = count
+        return stats
+
+
+class MetricsHistory:
+    """Fixed-size ring buffer of metric samples stored column-wise"""
+    
+    # (section, field, array typecode) per column; field is None for scalar sections
+    COLUMNS = (
+        ('cpu', 'percent', 'd'),
+        ('cpu', 'count', 'q'),
+        ('memory', 'percent', 'd'),
+        ('memory', 'used_gb', 'd'),
+        ('memory', 'total_gb', 'd'),
+        ('disk', 'percent', 'd'),
+        ('disk', 'used_gb', 'd'),
+        ('disk', 'total_gb', 'd'),
+        ('processes', None, 'q'),
+        ('network', 'bytes_sent', 'q'),
+        ('network', 'bytes_recv', 'q'),
+        ('network', 'packets_sent', 'q'),
+        ('network', 'packets_recv', 'q')
+    )
+    MISSING = -1  # Stored in integer columns for values reported as None (floats use NaN)
+    
+    def __init__(self, max_samples):
+        if max_samples < 0:
+            raise ValueError(f"max_samples must not be negative, got {max_samples}")
+        
+        self.max_samples = max_samples
+        self._columns = [array(typecode, [0]) * max_samples for _, _, typecode in self.COLUMNS]
+        self._timestamps = [None] * max_samples
+        self._head = 0  # Next slot to overwrite
+        self._count = 0
+    
+    def __len__(self):
+        return self._count
+    
+    def append(self, metrics):
+        """Store a metrics sample, overwriting the oldest one when full"""
+        if not self.max_samples:
+            return  # Like deque(maxlen=0): keep nothing
+        
+        # Convert the whole row before writing, so a bad value can't leave
+        # the slot (the oldest sample, once full) half overwritten
+        row = []
+        for section, field, typecode in self.COLUMNS:
+            value = metrics[section] if field is None else metrics[section][field]
+            if value is None:
+                value = self.MISSING if typecode == 'q' else math.nan
+            row.append(int(value) if typecode == 'q' else float(value))
+        
+        head = self._head
+        self._timestamps[head] = metrics['timestamp']
+        for column, value in zip(self._columns, row):
+            column[head] = value
+        
+        self._head = (head + 1) % self.max_samples
+        self._count = min(self._count + 1, self.max_samples)
+    
+    def get_sample(self, index):
+        """Rebuild the metrics dict stored in ring slot `index`"""
+        metrics = {'timestamp': self._timestamps[index]}
+        for column, (section, field, typecode) in zip(self._columns, self.COLUMNS):
+            value = column[index]
+            if value != value or (typecode == 'q' and value == self.MISSING):
+                value = None  # value != value only for NaN
+            
+            if field is None:
+                metrics[section] = value
+            else:
+                metrics.setdefault(section, {})[field] = value
+        
+        return metrics
+    
+    def tail(self, limit=None):
+        """Get the newest samples (all of them without a limit), oldest first"""
+        count = self._count
+        if limit and 0 < limit < count:
+            count = limit
+        
+        start = self._head - count
+        return [self.get_sample((start + i) % self.max_samples) for i in range(count)]
 
 
 class SystemMetrics:
@@ -153,17 +513,59 @@ class SystemMetrics:
     
     def __init__(self, max_history=100):
         self.max_history = max_history
-        self.metrics_history = deque(maxlen=max_history)
+        self.metrics_history = MetricsHistory(max_history)
         self.is_collecting = False
         self.collection_thread = None
+        self._stop_event = threading.Event()  # Paces the loop and wakes it on stop
         self.lock = threading.Lock()  # Thread safety for API access
         
+        # Latest sample as (monotonic time, metrics), shared by concurrent readers
+        self.current_max_age = 1.0
+        self._current_cache = (0.0, None)
+        self._current_lock = threading.Lock()
+        
+        # Values that are fixed for the life of the process
+        self._cpu_count = psutil.cpu_count()
+        self._disk_path = 'C:' if os.name == 'nt' else '/'  # Windows compatible
+        
+        # Non-blocking cpu_percent reports usage since its previous call, so
+        # this call only opens the first window; its own result is meaningless
+        psutil.cpu_percent(interval=None)
+        self._cpu_window_start = time.monotonic()
+        self.min_cpu_window = 0.1  # Shorter windows read as 0.0 or 100.0
+        self._cpu_percent = None  # Last reading taken over a long enough window
+    
     def get_current_metrics(self):
-        """Get current system metrics"""
+        """Get current system metrics, reusing a sample up to current_max_age old"""
+        sampled_at, metrics = self._current_cache
+        if metrics and time.monotonic() - sampled_at < self.current_max_age:
+            return metrics
+        
+        with self._current_lock:
+            # Another thread may have refreshed the sample while we waited
+            sampled_at, metrics = self._current_cache
+            if metrics and time.monotonic() - sampled_at < self.current_max_age:
+                return metrics
+            
+            metrics = self.collect_current_metrics()
+            if metrics:
+                self._current_cache = (time.monotonic(), metrics)
+            return metrics
+    
+    def collect_current_metrics(self):
+        """Take a fresh sample of system metrics"""
         try:
-            # CPU metrics
-            cpu_percent = psutil.cpu_percent(interval=1)
-            cpu_count = psutil.cpu_count()
+            # CPU metrics (non-blocking: usage since the previous reading);
+            # windows too short to mean anything reuse the last reading
+            elapsed = time.monotonic() - self._cpu_window_start
+            if elapsed >= self.min_cpu_window or self._cpu_percent is None:
+                if elapsed < self.min_cpu_window:
+                    # No reading yet: wait out the rest of the first window, once
+                    time.sleep(self.min_cpu_window - elapsed)
+                self._cpu_percent = psutil.cpu_percent(interval=None)
+                self._cpu_window_start = time.monotonic()
+            cpu_percent = self._cpu_percent
+            cpu_count = self._cpu_count
             
             # Memory metrics
             memory = psutil.virtual_memory()
@@ -171,8 +573,8 @@ class SystemMetrics:
             memory_used_gb = memory.used / (1024**3)
             memory_total_gb = memory.total / (1024**3)
             
-            # Disk metrics (Windows compatible)
-            disk = psutil.disk_usage('C:' if os.name == 'nt' else '/')
+            # Disk metrics
+            disk = psutil.disk_usage(self._disk_path)
             disk_percent = disk.percent
             disk_used_gb = disk.used / (1024**3)
             disk_total_gb = disk.total / (1024**3)
@@ -220,22 +622,32 @@ class SystemMetrics:
     
     def collect_metrics_continuously(self, interval=5):
         """Continuously collect metrics in background thread"""
-        while self.is_collecting:
+        # Sleep before each sample (returning early once stopped), so even the
+        # first stored sample's CPU reading covers a full interval
+        while not self._stop_event.wait(interval):
             metrics = self.get_current_metrics()
             if metrics:
-                with self.lock:
-                    self.metrics_history.append(metrics)
-                print(f"📊 [{metrics['timestamp'][:19]}] "
-                      f"CPU: {metrics['cpu']['percent']:5.1f}% | "
-                      f"Memory: {metrics['memory']['percent']:5.1f}% | "
-                      f"Disk: {metrics['disk']['percent']:5.1f}% | "
-                      f"Processes: {metrics['processes']}")
-            time.sleep(interval)
+                try:
+                    with self.lock:
+                        self.metrics_history.append(metrics)
+                except Exception as e:
+                    # A malformed sample must not end collection for good
+                    logging.error(f"Error storing metrics sample: {e}")
+                    continue
+                
+                logging.debug("📊 [%s] CPU: %5.1f%% | Memory: %5.1f%% | "
+                              "Disk: %5.1f%% | Processes: %s",
+                              metrics['timestamp'][:19],
+                              metrics['cpu']['percent'],
+                              metrics['memory']['percent'],
+                              metrics['disk']['percent'],
+                              metrics['processes'])
     
     def start_collection(self, interval=5):
         """Start continuous metrics collection"""
         if not self.is_collecting:
             self.is_collecting = True
+            self._stop_event.clear()
             self.collection_thread = threading.Thread(
                 target=self.collect_metrics_continuously,
                 args=(interval,),
@@ -249,19 +661,37 @@ class SystemMetrics:
     def stop_collection(self):
         """Stop continuous metrics collection"""
         self.is_collecting = False
+        self._stop_event.set()
         if self.collection_thread:
-            self.collection_thread.join(timeout=1)
+            # Wakes immediately, so this waits for at most one in-flight sample
+            self.collection_thread.join()
         print("🛑 Metrics collection stopped")
     
     def get_metrics_history(self, limit=None):
         """Get metrics history with optional limit"""
         with self.lock:
-            metrics = list(self.metrics_history)
-        
-        if limit:
-            metrics = metrics[-limit:]
-        
-        return metrics
+            return self.metrics_history.tail(limit)
+
+
+class ORJSONProvider(JSONProvider):
+    """Flask JSON provider backed by orjson for faster API responses"""
+    
+    # Match Flask's default provider, which sorts keys in responses
+    options = orjson.OPT_SORT_KEYS
+    
+    def dumps(self, obj, **kwargs):
+        return orjson.dumps(obj, option=self.options).decode('utf-8')
+    
+    def loads(self, s, **kwargs):
+        return orjson.loads(s)
+    
+    def response(self, *args, **kwargs):
+        """Build a JSON response straight from orjson's bytes output"""
+        obj = self._prepare_response_obj(args, kwargs)
+        return self._app.response_class(
+            orjson.dumps(obj, option=self.options),
+            mimetype='application/json'
+        )
 
 
 class LogMetricsCollector:
@@ -270,7 +700,8 @@ class LogMetricsCollector:
     def __init__(self, config=None):
         # Default configuration
         self.config = config or {
-            'api': {'host': '0.0.0.0', 'port': 5000, 'debug': False},
+            'api': {'host': '0.0.0.0', 'port': 5000, 'debug': False,
+                    'server': 'waitress', 'threads': 8},
             'metrics': {'collection_interval': 10, 'max_samples': 1000},
             'logging': {'directories': ['logs'], 'max_entries': 200}
         }
@@ -287,6 +718,7 @@ class LogMetricsCollector:
         
         # Initialize Flask app
         self.app = Flask(__name__)
+        self.app.json = ORJSONProvider(self.app)
         CORS(self.app)  # Enable CORS for web browser access
         self.setup_api_routes()
         
@@ -467,6 +899,14 @@ class LogMetricsCollector:
                     path=log_dir,
                     recursive=True
                 )
+                
+                # Register existing log files so their events skip suffix checks
+                for dir_path, _, filenames in os.walk(log_dir):
+                    self.log_handler.watched_paths.update(
+                        os.path.join(dir_path, filename)
+                        for filename in filenames
+                        if filename.endswith('.log')
+                    )
                 print(f"👀 Monitoring log directory: {log_dir}")
             else:
                 print(f"⚠️  Log directory not found: {log_dir}")
@@ -485,16 +925,9 @@ class LogMetricsCollector:
                 for filename in os.listdir(log_dir):
                     if filename.endswith('.log'):
                         file_path = os.path.join(log_dir, filename)
-                        try:
-                            with open(file_path, 'r', encoding='utf-8') as f:
-                                lines = f.readlines()
-                                # Load last 10 lines to show recent context
-                                for line in lines[-10:]:
-                                    line = line.strip()
-                                    if line:
-                                        self.log_collector.add_log_entry(file_path, line)
-                        except Exception as e:
-                            logging.error(f"Error loading {file_path}: {e}")
+                        # Load last 10 lines to show recent context
+                        for line in tail_log_file(file_path, lines=10):
+                            self.log_collector.add_log_entry(file_path, line)
     
     def stop_monitoring(self):
         """Stop all monitoring"""
@@ -504,6 +937,7 @@ class LogMetricsCollector:
         self.metrics_collector.stop_collection()
         self.file_observer.stop()
         self.file_observer.join()
+        self.log_handler.close()
         
         self.display_summary()
     
@@ -518,7 +952,7 @@ class LogMetricsCollector:
         print(f"📊 Collected {metrics_count} metric samples")
         
         if metrics_count > 0:
-            latest_metrics = self.metrics_collector.metrics_history[-1]
+            latest_metrics = self.metrics_collector.get_metrics_history(limit=1)[-1]
             print(f"💻 Final CPU: {latest_metrics['cpu']['percent']}%")
             print(f"🧠 Final Memory: {latest_metrics['memory']['percent']}%")
             print(f"💾 Final Disk: {latest_metrics['disk']['percent']}%")
@@ -539,18 +973,50 @@ class LogMetricsCollector:
         host = self.config['api']['host']
         port = self.config['api']['port']
         debug = self.config['api']['debug']
+        server = self.config['api'].get('server', 'waitress')
+        
+        if server not in ('waitress', 'werkzeug'):
+            raise ValueError(
+                f"Unsupported api.server {server!r}; expected 'waitress' or 'werkzeug'"
+            )
         
         print(f"🌐 Starting REST API server on http://{host}:{port}")
         print(f"📚 API Documentation available at: http://{host}:{port}/")
         
-        # Run Flask app
-        self.app.run(
-            host=host,
-            port=port,
-            debug=debug,
-            threaded=True,
-            use_reloader=False  # Disable reloader to avoid threading issues
-        )
+        if server == 'werkzeug' or debug:
+            # Werkzeug development server (also needed for Flask's debugger)
+            self.app.run(
+                host=host,
+                port=port,
+                debug=debug,
+                threaded=True,
+                use_reloader=False  # Disable reloader to avoid threading issues
+            )
+        else:
+            # Production WSGI server; stays in-process so the API shares
+            # state with the collector threads started in this process
+            serve(
+                self.app,
+                host=host,
+                port=port,
+                threads=self.config['api'].get('threads', 8)
+            )
+
+
+def tail_log_file(file_path, lines=10):
+    """Get the last non-empty lines of a log file, streaming it instead of loading it whole"""
+    if not os.path.exists(file_path):
+        return []
+    
+    try:
+        with open(file_path, 'r', encoding='utf-8', errors='replace') as f:
+            # Only the last `lines` lines are ever held in memory
+            tail = deque(f, maxlen=lines)
+    except Exception as e:
+        logging.error(f"Error loading {file_path}: {e}")
+        return []
+    
+    return [line.strip() for line in tail if line.strip()]
 
 
 def load_config(config_file='config.json'):
@@ -559,7 +1025,9 @@ def load_config(config_file='config.json'):
         'api': {
             'host': '0.0.0.0',
             'port': 5000,
-            'debug': False
+            'debug': False,
+            'server': 'waitress',
+            'threads': 8
         },
         'metrics': {
             'collection_interval': 10,
@@ -691,7 +1159,8 @@ def main():
             collector.run_api_server()
         else:
             # Console-only mode
-            print("\n💡 Try adding entries to logs/test.log in another terminal:")
+            print("\n💡 Run with --log-level DEBUG to echo each log entry and metrics sample")
+            print("💡 Try adding entries to logs/test.log in another terminal:")
             print("   echo \"[ERROR] This is a test error\" >> logs/test.log")
             print("   echo \"[INFO] Application restarted\" >> logs/test.log\n")
             
@@ -1,22 +1,92 @@
 # tests/test_app.py
 import pytest
+import io
 import json
 import time
 import os
-from unittest.mock import patch, mock_open, MagicMock
-import psutil
-from app import app
+from datetime import datetime
+from types import SimpleNamespace
+from unittest.mock import patch, mock_open, DEFAULT
+from watchdog.events import FileDeletedEvent, FileMovedEvent
 
 
-@pytest.fixture
-def client():
-    """Create a test client for the Flask application."""
-    app.config['TESTING'] = True
-    with app.test_client() as client:
-        yield client
+# psutil readings shared by the metrics collection tests
+_MEM_MOCK = SimpleNamespace(
+    total=8589934592,
+    available=4294967296,
+    percent=50.0,
+    used=4294967296,
+    free=4294967296
+)
+_DISK_MOCK = SimpleNamespace(
+    total=107374182400,
+    used=53687091200,
+    free=53687091200,
+    percent=50.0
+)
+_NET_MOCK = SimpleNamespace(
+    bytes_sent=2048,
+    bytes_recv=4096,
+    packets_sent=20,
+    packets_recv=40
+)
+_PIDS_MOCK = list(range(1, 43))
 
 
-@pytest.fixture
+@pytest.fixture(autouse=True, scope="session")
+def fast_psutil():
+    """Replace the psutil probes SystemMetrics samples with constant readings for the whole session."""
+    with patch.multiple('psutil',
+                        cpu_percent=lambda interval=None: 25.5,
+                        virtual_memory=lambda: _MEM_MOCK,
+                        disk_usage=lambda path: _DISK_MOCK,
+                        pids=lambda: _PIDS_MOCK,
+                        net_io_counters=lambda: _NET_MOCK):
+        yield
+
+
+@pytest.fixture(scope="session")
+def app_module():
+    """Import the application module on first use instead of at collection time."""
+    import app
+    return app
+
+
+@pytest.fixture(scope="session")
+def collector(app_module, tmp_path_factory):
+    """Provide a LogMetricsCollector watching an empty temporary log directory."""
+    config = app_module.load_config(str(tmp_path_factory.getbasetemp() / 'missing.json'))
+    config['metrics']['max_samples'] = 10
+    config['logging']['directories'] = [str(tmp_path_factory.mktemp('logs'))]
+    config['logging']['max_entries'] = 50
+    collector = app_module.LogMetricsCollector(config)
+    collector.metrics_collector.min_cpu_window = 0  # Report CPU from the first request
+    return collector
+
+
+@pytest.fixture(scope="session")
+def flask_app(collector):
+    """Provide the collector's Flask application configured for testing."""
+    collector.app.config['TESTING'] = True
+    return collector.app
+
+
+@pytest.fixture(scope="session")
+def client(flask_app):
+    """Create a test client for the Flask application, shared by the whole session."""
+    # Not entered as a context manager: a preserved request context would be
+    # torn down from the wrong thread by the concurrent request tests
+    return flask_app.test_client()
+
+
+@pytest.fixture(scope="class")
+def metrics_response(client):
+    """Fetch /metrics?current=true once per test class and share the (response, data) pair."""
+    response = client.get('/metrics?current=true')
+    return response, response.get_json()
+
+
+@pytest.fixture(scope="session")
 def mock_log_data():
     """Provide mock log data for testing."""
     return [
@@ -28,177 +98,156 @@ def mock_log_data():
     ]
 
 
-@pytest.fixture
-def mock_system_metrics():
-    """Provide mock system metrics data."""
-    return {
-        'cpu_percent': 45.2,
-        'memory': {
-            'total': 8589934592,
-            'available': 4294967296,
-            'percent': 50.0,
-            'used': 4294967296,
-            'free': 4294967296
-        },
-        'disk_io': {
-            'read_count': 1000,
-            'write_count': 500,
-            'read_bytes': 1048576,
-            'write_bytes': 524288
-        },
-        'timestamp': '2024-01-15T10:00:00'
-    }
+def _assert_500_error(response):
+    """Assert that a response is a 500 carrying a JSON error payload."""
+    assert response.status_code == 500
+    data = response.get_json(silent=True)
+    assert data is not None and 'error' in data
 
 
 class TestHealthEndpoint:
     """Test suite for health check endpoint."""
     
-    def test_health_endpoint_returns_200(self, client):
-        """Test that health endpoint returns 200 status."""
+    def test_health_endpoint(self, client):
+        """Test that health endpoint returns 200 with a healthy status and timestamp as JSON."""
         response = client.get('/health')
         assert response.status_code == 200
-    
-    def test_health_endpoint_returns_json(self, client):
-        """Test that health endpoint returns valid JSON."""
-        response = client.get('/health')
-        data = json.loads(response.data)
+        
+        data = response.get_json()
         assert isinstance(data, dict)
         assert 'status' in data
         assert 'timestamp' in data
-    
-    def test_health_endpoint_status_ok(self, client):
-        """Test that health endpoint reports OK status."""
-        response = client.get('/health')
-        data = json.loads(response.data)
-        assert data['status'] == 'OK'
-    
-    def test_health_endpoint_has_timestamp(self, client):
-        """Test that health endpoint includes timestamp."""
-        response = client.get('/health')
-        data = json.loads(response.data)
-        assert 'timestamp' in data
+        assert data['status'] == 'healthy'
         assert isinstance(data['timestamp'], str)
 
 
 class TestMetricsEndpoint:
     """Test suite for system metrics endpoint."""
     
-    def test_metrics_endpoint_returns_200(self, client):
+    def test_metrics_endpoint_returns_200(self, metrics_response):
         """Test that metrics endpoint returns 200 status."""
-        response = client.get('/metrics')
+        response, _ = metrics_response
         assert response.status_code == 200
     
-    def test_metrics_endpoint_returns_json(self, client):
-        """Test that metrics endpoint returns valid JSON."""
-        response = client.get('/metrics')
-        data = json.loads(response.data)
+    def test_metrics_endpoint_returns_json(self, metrics_response):
+        """Test that metrics endpoint returns valid JSON with a single current sample."""
+        _, data = metrics_response
         assert isinstance(data, dict)
+        assert data['type'] == 'current'
+        assert data['count'] == len(data['metrics']) == 1
     
-    def test_metrics_contains_required_fields(self, client):
-        """Test that metrics response contains all required fields."""
-        response = client.get('/metrics')
-        data = json.loads(response.data)
-        
-        required_fields = ['cpu_percent', 'memory', 'disk_io', 'timestamp']
-        for field in required_fields:
-            assert field in data, f"Missing required field: {field}"
+    @pytest.mark.parametrize("field", ['timestamp', 'cpu', 'memory', 'disk', 'processes', 'network'])
+    def test_metrics_contains_required_fields(self, metrics_response, field):
+        """Test that the metrics sample contains each required field."""
+        _, data = metrics_response
+        assert field in data['metrics'][0], f"Missing required field: {field}"
     
-    def test_metrics_data_types(self, client):
+    def test_metrics_data_types(self, metrics_response):
         """Test that metrics data has correct types."""
-        response = client.get('/metrics')
-        data = json.loads(response.data)
+        sample = metrics_response[1]['metrics'][0]
         
-        assert isinstance(data['cpu_percent'], (int, float))
-        assert isinstance(data['memory'], dict)
-        assert isinstance(data['disk_io'], dict)
-        assert isinstance(data['timestamp'], str)
+        assert isinstance(sample['cpu'], dict)
+        assert isinstance(sample['memory'], dict)
+        assert isinstance(sample['disk'], dict)
+        assert isinstance(sample['processes'], int)
+        assert isinstance(sample['timestamp'], str)
     
-    def test_memory_metrics_structure(self, client):
+    def test_memory_metrics_structure(self, metrics_response):
         """Test that memory metrics have correct structure."""
-        response = client.get('/metrics')
-        data = json.loads(response.data)
+        memory = metrics_response[1]['metrics'][0]['memory']
         
-        memory = data['memory']
-        expected_keys = ['total', 'available', 'percent', 'used', 'free']
-        for key in expected_keys:
-            assert key in memory, f"Missing memory metric: {key}"
-            assert isinstance(memory[key], (int, float))
+        expected_keys = ['percent', 'used_gb', 'total_gb']
+        missing = set(expected_keys) - memory.keys()
+        assert not missing, f"Missing memory metrics: {missing}"
+        assert all(isinstance(memory[key], (int, float)) for key in expected_keys)
     
-    def test_disk_io_metrics_structure(self, client):
-        """Test that disk I/O metrics have correct structure."""
-        response = client.get('/metrics')
-        data = json.loads(response.data)
+    def test_disk_metrics_structure(self, metrics_response):
+        """Test that disk metrics have correct structure."""
+        disk = metrics_response[1]['metrics'][0]['disk']
         
-        disk_io = data['disk_io']
-        expected_keys = ['read_count', 'write_count', 'read_bytes', 'write_bytes']
-        for key in expected_keys:
-            assert key in disk_io, f"Missing disk I/O metric: {key}"
-            assert isinstance(disk_io[key], (int, float))
+        expected_keys = ['percent', 'used_gb', 'total_gb']
+        missing = set(expected_keys) - disk.keys()
+        assert not missing, f"Missing disk metrics: {missing}"
+        assert all(isinstance(disk[key], (int, float)) for key in expected_keys)
     
-    def test_cpu_percent_range(self, client):
+    def test_cpu_percent_range(self, metrics_response):
         """Test that CPU percentage is within valid range."""
-        response = client.get('/metrics')
-        data = json.loads(response.data)
-        
-        cpu_percent = data['cpu_percent']
+        cpu_percent = metrics_response[1]['metrics'][0]['cpu']['percent']
         assert 0 <= cpu_percent <= 100, f"CPU percentage out of range: {cpu_percent}"
     
-    def test_memory_percent_range(self, client):
+    def test_memory_percent_range(self, metrics_response):
         """Test that memory percentage is within valid range."""
-        response = client.get('/metrics')
-        data = json.loads(response.data)
-        
-        memory_percent = data['memory']['percent']
+        memory_percent = metrics_response[1]['metrics'][0]['memory']['percent']
         assert 0 <= memory_percent <= 100, f"Memory percentage out of range: {memory_percent}"
+    
+    def test_metrics_history(self, client, collector, app_module):
+        """Test that historical metrics are returned oldest first and honour the limit."""
+        metrics_collector = collector.metrics_collector
+        sample = metrics_collector.collect_current_metrics()
+        with patch.object(metrics_collector, 'metrics_history', app_module.MetricsHistory(10)):
+            for second in range(3):
+                metrics_collector.metrics_history.append(
+                    dict(sample, timestamp=f'2024-01-15T10:00:0{second}'))
+            
+            data = client.get('/metrics?limit=2').get_json()
+        
+        assert data['type'] == 'historical'
+        assert data['count'] == 2
+        assert [m['timestamp'] for m in data['metrics']] == [
+            '2024-01-15T10:00:01', '2024-01-15T10:00:02']
 
 
 class TestLogsEndpoint:
     """Test suite for logs endpoint."""
     
-    @patch('app.get_recent_logs')
-    def test_logs_endpoint_returns_200(self, mock_get_logs, client):
+    @pytest.fixture(autouse=True)
+    def _mock_logs(self, collector):
+        """Patch the collector's get_recent_logs for every test in the class."""
+        with patch.object(collector.log_collector, 'get_recent_logs') as mock_get_logs:
+            self.mock_logs = mock_get_logs
+            yield
+    
+    def test_logs_endpoint_returns_200(self, client):
         """Test that logs endpoint returns 200 status."""
-        mock_get_logs.return_value = []
+        self.mock_logs.return_value = []
         response = client.get('/logs')
         assert response.status_code == 200
     
-    @patch('app.get_recent_logs')
-    def test_logs_endpoint_returns_json(self, mock_get_logs, client):
+    def test_logs_endpoint_returns_json(self, client):
         """Test that logs endpoint returns valid JSON."""
-        mock_get_logs.return_value = []
+        self.mock_logs.return_value = []
         response = client.get('/logs')
-        data = json.loads(response.data)
+        data = response.get_json()
         assert isinstance(data, dict)
         assert 'logs' in data
         assert 'count' in data
     
-    @patch('app.get_recent_logs')
-    def test_logs_with_data(self, mock_get_logs, client, mock_log_data):
+    def test_logs_with_data(self, client, mock_log_data):
         """Test logs endpoint with mock data."""
-        mock_get_logs.return_value = mock_log_data
+        self.mock_logs.return_value = mock_log_data
         response = client.get('/logs')
-        data = json.loads(response.data)
+        data = response.get_json()
         
         assert data['count'] == len(mock_log_data)
         assert len(data['logs']) == len(mock_log_data)
         assert data['logs'] == mock_log_data
     
-    @patch('app.get_recent_logs')
-    def test_logs_limit_parameter(self, mock_get_logs, client, mock_log_data):
+    def test_logs_limit_parameter(self, client, mock_log_data):
         """Test logs endpoint with limit parameter."""
-        mock_get_logs.return_value = mock_log_data[:2]
-        response = client.get('/logs?limit=2')
-        data = json.loads(response.data)
+        self.mock_logs.return_value = mock_log_data[:2]
+        response = client.get('/logs?limit=2&level=info')
+        data = response.get_json()
         
+        self.mock_logs.assert_called_once_with(limit=2, level_filter='info')
         assert data['count'] == 2
         assert len(data['logs']) == 2
+        assert data['filter'] == {'level': 'info', 'limit': 2}
     
-    @patch('app.get_recent_logs')
-    def test_logs_empty_response(self, mock_get_logs, client):
+    def test_logs_empty_response(self, client):
         """Test logs endpoint with no logs available."""
-        mock_get_logs.return_value = []
+        self.mock_logs.return_value = []
         response = client.get('/logs')
-        data = json.loads(response.data)
+        data = response.get_json()
         
         assert data['count'] == 0
         assert data['logs'] == []
@@ -207,182 +256,499 @@ class TestLogsEndpoint:
 class TestSystemMetricsCollection:
     """Test suite for system metrics collection functions."""
     
-    @patch('psutil.cpu_percent')
-    @patch('psutil.virtual_memory')
-    @patch('psutil.disk_io_counters')
-    def test_collect_system_metrics_structure(self, mock_disk_io, mock_memory, mock_cpu):
-        """Test that collect_system_metrics returns correct structure."""
-        from app import collect_system_metrics
-        
-        # Mock psutil responses
-        mock_cpu.return_value = 25.5
-        mock_memory.return_value = MagicMock(
-            total=8589934592,
-            available=4294967296,
-            percent=50.0,
-            used=4294967296,
-            free=4294967296
-        )
-        mock_disk_io.return_value = MagicMock(
-            read_count=1000,
-            write_count=500,
-            read_bytes=1048576,
-            write_bytes=524288
-        )
-        
-        metrics = collect_system_metrics()
-        
-        assert 'cpu_percent' in metrics
+    @pytest.fixture
+    def psutil_mocks(self, app_module):
+        """Patch the psutil probes used by app with a single patcher, keyed by name."""
+        with patch.multiple('app.psutil', cpu_percent=DEFAULT, virtual_memory=DEFAULT,
+                            disk_usage=DEFAULT, pids=DEFAULT, net_io_counters=DEFAULT) as mocks:
+            mocks['cpu_percent'].return_value = 25.5
+            mocks['virtual_memory'].return_value = _MEM_MOCK
+            mocks['disk_usage'].return_value = _DISK_MOCK
+            mocks['pids'].return_value = _PIDS_MOCK
+            mocks['net_io_counters'].return_value = _NET_MOCK
+            yield mocks
+    
+    @pytest.fixture
+    def system_metrics(self, app_module, psutil_mocks):
+        """Provide a fresh SystemMetrics collector that reports CPU immediately."""
+        system_metrics = app_module.SystemMetrics(max_history=10)
+        system_metrics.min_cpu_window = 0
+        return system_metrics
+    
+    def test_collect_system_metrics_structure(self, system_metrics):
+        """Test that collect_current_metrics returns correct structure."""
+        metrics = system_metrics.collect_current_metrics()
+        
+        assert 'cpu' in metrics
         assert 'memory' in metrics
-        assert 'disk_io' in metrics
+        assert 'disk' in metrics
         assert 'timestamp' in metrics
         
-        assert metrics['cpu_percent'] == 25.5
+        assert metrics['cpu']['percent'] == 25.5
         assert metrics['memory']['percent'] == 50.0
-        assert metrics['disk_io']['read_count'] == 1000
-    
-    @patch('psutil.cpu_percent')
-    @patch('psutil.virtual_memory')
-    @patch('psutil.disk_io_counters')
-    def test_collect_metrics_handles_cpu_exception(self, mock_disk_io, mock_memory, mock_cpu):
-        """Test that metrics collection handles CPU exceptions gracefully."""
-        from app import collect_system_metrics
-        
-        mock_cpu.side_effect = Exception("CPU error")
-        mock_memory.return_value = MagicMock(
-            total=8589934592,
-            available=4294967296,
-            percent=50.0,
-            used=4294967296,
-            free=4294967296
-        )
-        mock_disk_io.return_value = MagicMock(
-            read_count=1000,
-            write_count=500,
-            read_bytes=1048576,
-            write_bytes=524288
-        )
-        
-        metrics = collect_system_metrics()
-        assert 'cpu_percent' in metrics
-        assert metrics['cpu_percent'] == 0.0
-    
-    @patch('psutil.cpu_percent')
-    @patch('psutil.virtual_memory')
-    @patch('psutil.disk_io_counters')
-    def test_collect_metrics_handles_memory_exception(self, mock_disk_io, mock_memory, mock_cpu):
-        """Test that metrics collection handles memory exceptions gracefully."""
-        from app import collect_system_metrics
-        
-        mock_cpu.return_value = 25.5
-        mock_memory.side_effect = Exception("Memory error")
-        mock_disk_io.return_value = MagicMock(
-            read_count=1000,
-            write_count=500,
-            read_bytes=1048576,
-            write_bytes=524288
-        )
-        
-        metrics = collect_system_metrics()
-        assert 'memory' in metrics
-        assert all(v == 0 for v in metrics['memory'].values())
-    
-    @patch('psutil.cpu_percent')
-    @patch('psutil.virtual_memory')
-    @patch('psutil.disk_io_counters')
-    def test_collect_metrics_handles_disk_exception(self, mock_disk_io, mock_memory, mock_cpu):
-        """Test that metrics collection handles disk I/O exceptions gracefully."""
-        from app import collect_system_metrics
-        
-        mock_cpu.return_value = 25.5
-        mock_memory.return_value = MagicMock(
-            total=8589934592,
-            available=4294967296,
-            percent=50.0,
-            used=4294967296,
-            free=4294967296
-        )
-        mock_disk_io.side_effect = Exception("Disk I/O error")
-        
-        metrics = collect_system_metrics()
-        assert 'disk_io' in metrics
-        assert all(v == 0 for v in metrics['disk_io'].values())
+        assert metrics['memory']['total_gb'] == 8.0
+        assert metrics['disk']['used_gb'] == 50.0
+        assert metrics['processes'] == len(_PIDS_MOCK)
+        assert metrics['network']['bytes_recv'] == 4096
+    
+    def test_collect_metrics_handles_cpu_exception(self, psutil_mocks, system_metrics):
+        """Test that a CPU probe failure is reported as a missing sample, not raised."""
+        psutil_mocks['cpu_percent'].side_effect = Exception("CPU error")
+        
+        assert system_metrics.collect_current_metrics() is None
+    
+    def test_collect_metrics_handles_memory_exception(self, psutil_mocks, system_metrics):
+        """Test that a memory probe failure is reported as a missing sample, not raised."""
+        psutil_mocks['virtual_memory'].side_effect = Exception("Memory error")
+        
+        assert system_metrics.collect_current_metrics() is None
+    
+    def test_collect_metrics_handles_disk_exception(self, psutil_mocks, system_metrics):
+        """Test that a disk probe failure is reported as a missing sample, not raised."""
+        psutil_mocks['disk_usage'].side_effect = Exception("Disk error")
+        
+        assert system_metrics.collect_current_metrics() is None
+    
+    def test_cpu_percent_reuses_reading_within_window(self, app_module, psutil_mocks):
+        """Test that CPU is never reported from a too-short window, and never as None."""
+        psutil_mocks['cpu_percent'].side_effect = [0.0, 10.0, 20.0]  # Priming call first
+        system_metrics = app_module.SystemMetrics(max_history=10)
+        system_metrics.min_cpu_window = 0.05
+        
+        # The first reading waits out the rest of the window instead of returning noise
+        start = time.monotonic()
+        assert system_metrics.collect_current_metrics()['cpu']['percent'] == 10.0
+        assert time.monotonic() - start >= 0.04
+        
+        # Within the next window the last reading is reused without asking psutil
+        assert system_metrics.collect_current_metrics()['cpu']['percent'] == 10.0
+        assert psutil_mocks['cpu_percent'].call_count == 2
+        
+        time.sleep(0.06)
+        assert system_metrics.collect_current_metrics()['cpu']['percent'] == 20.0
+    
+    def test_first_stored_sample_waits_one_interval(self, system_metrics):
+        """Test that continuous collection doesn't store a sample right at start-up."""
+        system_metrics.start_collection(interval=60)
+        try:
+            assert len(system_metrics.metrics_history) == 0
+        finally:
+            system_metrics.stop_collection()
+        
+        assert len(system_metrics.metrics_history) == 0
+    
+    def test_collect_metrics_handles_network_exception(self, psutil_mocks, system_metrics):
+        """Test that network counters fall back to zeros when the probe fails."""
+        psutil_mocks['net_io_counters'].side_effect = Exception("Network error")
+        
+        metrics = system_metrics.collect_current_metrics()
+        assert all(v == 0 for v in metrics['network'].values())
+
+
+class TestMetricsHistory:
+    """Test suite for the column-wise metrics ring buffer."""
+    
+    @staticmethod
+    def _sample(timestamp, cpu_percent=25.5, processes=42):
+        return {
+            'timestamp': timestamp,
+            'cpu': {'percent': cpu_percent, 'count': 4},
+            'memory': {'percent': 50.0, 'used_gb': 4.0, 'total_gb': 8.0},
+            'disk': {'percent': 50.0, 'used_gb': 50.0, 'total_gb': 100.0},
+            'processes': processes,
+            'network': {'bytes_sent': 2048, 'bytes_recv': 4096, 'packets_sent': 20, 'packets_recv': 40}
+        }
+    
+    def test_tail_before_wraparound(self, app_module):
+        """Test that a partly filled history returns its samples oldest first."""
+        history = app_module.MetricsHistory(5)
+        for i in range(3):
+            history.append(self._sample(f't{i}'))
+        
+        assert len(history) == 3
+        assert [m['timestamp'] for m in history.tail()] == ['t0', 't1', 't2']
+    
+    def test_tail_after_wraparound(self, app_module):
+        """Test that a wrapped history keeps the newest samples, oldest first, within the limit."""
+        history = app_module.MetricsHistory(3)
+        for i in range(5):
+            history.append(self._sample(f't{i}', processes=i))
+        
+        assert len(history) == 3
+        assert [m['timestamp'] for m in history.tail()] == ['t2', 't3', 't4']
+        assert [m['processes'] for m in history.tail(2)] == [3, 4]
+        assert history.tail(1)[0] == self._sample('t4', processes=4)
+    
+    def test_missing_values_round_trip(self, app_module):
+        """Test that values reported as None are read back as None in float and integer columns."""
+        history = app_module.MetricsHistory(2)
+        history.append(self._sample('t0', cpu_percent=None, processes=None))
+        
+        sample = history.tail()[0]
+        assert sample['cpu']['percent'] is None
+        assert sample['processes'] is None
+    
+    def test_float_in_integer_column(self, app_module):
+        """Test that a float reported for an integer column is stored rather than rejected."""
+        history = app_module.MetricsHistory(2)
+        history.append(self._sample('t0', processes=42.0))
+        
+        assert history.tail()[0]['processes'] == 42
+    
+    def test_zero_size_keeps_nothing(self, app_module):
+        """Test that a zero-sized history accepts samples but stores none."""
+        history = app_module.MetricsHistory(0)
+        history.append(self._sample('t0'))
+        
+        assert len(history) == 0
+        assert history.tail() == []
+    
+    def test_negative_size_rejected(self, app_module):
+        """Test that a negative size is rejected up front."""
+        with pytest.raises(ValueError):
+            app_module.MetricsHistory(-1)
+    
+    def test_bad_sample_does_not_stop_collection(self, app_module):
+        """Test that a sample that can't be stored is skipped without ending the collection loop."""
+        system_metrics = app_module.SystemMetrics(max_history=5)
+        samples = [self._sample('t0', processes='many'), self._sample('t1')]
+        
+        with patch.object(system_metrics, 'get_current_metrics', side_effect=samples), \
+             patch.object(system_metrics._stop_event, 'wait', side_effect=[False, False, True]):
+            system_metrics.collect_metrics_continuously(interval=0)
+        
+        assert [m['timestamp'] for m in system_metrics.get_metrics_history()] == ['t1']
 
 
 class TestLogTailing:
     """Test suite for log tailing functionality."""
     
-    @patch('builtins.open', new_callable=mock_open, read_data="line1\nline2\nline3\n")
+    @patch('builtins.open', side_effect=lambda *args, **kwargs: io.StringIO("line1\nline2\nline3\n"))
     @patch('os.path.exists')
-    def test_tail_log_file_reads_lines(self, mock_exists, mock_file):
+    def test_tail_log_file_reads_lines(self, mock_exists, mock_file, app_module):
         """Test that tail_log_file reads lines correctly."""
-        from app import tail_log_file
-        
         mock_exists.return_value = True
         
-        lines = tail_log_file('/fake/path/test.log', lines=2)
+        lines = app_module.tail_log_file('/fake/path/test.log', lines=2)
         assert len(lines) == 2
         assert lines[0] == 'line2'
         assert lines[1] == 'line3'
     
     @patch('os.path.exists')
-    def test_tail_log_file_nonexistent_file(self, mock_exists):
+    def test_tail_log_file_nonexistent_file(self, mock_exists, app_module):
         """Test tail_log_file behavior with nonexistent file."""
-        from app import tail_log_file
-        
         mock_exists.return_value = False
         
-        lines = tail_log_file('/nonexistent/file.log')
+        lines = app_module.tail_log_file('/nonexistent/file.log')
         assert lines == []
     
     @patch('builtins.open')
     @patch('os.path.exists')
-    def test_tail_log_file_handles_permission_error(self, mock_exists, mock_open):
+    def test_tail_log_file_handles_permission_error(self, mock_exists, mock_open, app_module):
         """Test tail_log_file handles permission errors gracefully."""
-        from app import tail_log_file
-        
         mock_exists.return_value = True
         mock_open.side_effect = PermissionError("Access denied")
         
-        lines = tail_log_file('/restricted/file.log')
+        lines = app_module.tail_log_file('/restricted/file.log')
         assert lines == []
     
-    @patch('builtins.open', new_callable=mock_open, read_data="")
+    @patch('builtins.open', side_effect=lambda *args, **kwargs: io.StringIO(""))
     @patch('os.path.exists')
-    def test_tail_log_file_empty_file(self, mock_exists, mock_file):
+    def test_tail_log_file_empty_file(self, mock_exists, mock_file, app_module):
         """Test tail_log_file with empty file."""
-        from app import tail_log_file
-        
         mock_exists.return_value = True
         
-        lines = tail_log_file('/empty/file.log')
+        lines = app_module.tail_log_file('/empty/file.log')
         assert lines == []
 
 
+class TestRingBuffer:
+    """Test suite for the fixed-size log entry ring buffer."""
+    
+    def test_tail_before_wraparound(self, app_module):
+        """Test that a partly filled buffer returns its items oldest first."""
+        ring = app_module.RingBuffer(5)
+        for i in range(3):
+            assert ring.append(i) is None
+        
+        assert len(ring) == 3
+        assert ring.tail() == [0, 1, 2]
+    
+    @pytest.mark.parametrize("limit, expected", [
+        (None, [3, 4, 5, 6]),
+        (0, [3, 4, 5, 6]),
+        (2, [5, 6]),
+        (3, [4, 5, 6]),
+        (10, [3, 4, 5, 6])
+    ])
+    def test_tail_after_wraparound(self, app_module, limit, expected):
+        """Test that a wrapped buffer returns the newest items, oldest first, within the limit."""
+        ring = app_module.RingBuffer(4)
+        evicted = [ring.append(i) for i in range(7)]
+        
+        assert evicted == [None, None, None, None, 0, 1, 2]
+        assert ring.tail(limit) == expected
+    
+    def test_popleft_removes_oldest(self, app_module):
+        """Test that popleft takes items from the old end, across the wrap point."""
+        ring = app_module.RingBuffer(3)
+        for i in range(5):
+            ring.append(i)
+        
+        assert [ring.popleft() for _ in range(3)] == [2, 3, 4]
+        assert ring.tail() == []
+        with pytest.raises(IndexError):
+            ring.popleft()
+    
+    def test_zero_size_keeps_nothing(self, app_module):
+        """Test that a zero-sized buffer, and a log collector built on it, store nothing."""
+        ring = app_module.RingBuffer(0)
+        assert ring.append('a') is None
+        assert ring.tail() == []
+        
+        log_collector = app_module.LogCollector(max_entries=0)
+        log_collector.add_log_entry('/var/log/app.log', '[ERROR] dropped')
+        assert log_collector.get_recent_logs(level_filter='ERROR') == []
+        assert log_collector.get_log_stats()['error_count'] == 1
+    
+    def test_negative_size_rejected(self, app_module):
+        """Test that a negative size is rejected up front."""
+        with pytest.raises(ValueError):
+            app_module.RingBuffer(-1)
+
+
+class TestLogCollector:
+    """Test suite for the in-memory log store."""
+    
+    @pytest.fixture
+    def log_collector(self, app_module):
+        """Provide a LogCollector small enough to wrap around quickly."""
+        return app_module.LogCollector(max_entries=7)
+    
+    @pytest.mark.parametrize("line, level", [
+        ('[ERROR] disk full', 'ERROR'),
+        ('2024-01-15 10:00:01 [warn] slow query', 'WARNING'),
+        ('[Critical] kernel panic', 'ERROR'),
+        ('[TRACE] entering handler', 'DEBUG'),
+        ('[INFORMATION] started', 'INFO')
+    ])
+    def test_bracketed_level_skips_regex(self, log_collector, app_module, line, level):
+        """Test that a leading "[LEVEL]" token is resolved without running the regex."""
+        with patch.object(app_module, '_LEVEL_RE') as mock_re:
+            assert log_collector.extract_log_level(line) == level
+        assert not mock_re.search.called
+    
+    @pytest.mark.parametrize("line, level", [
+        ('[main] ERROR connection refused', 'ERROR'),
+        ('2024-01-15 10:00:02 DEBUG Loading configuration', 'DEBUG'),
+        ('[2024-01-15 10:00:03] Warning: retrying', 'WARNING'),
+        ('[unterminated INFO bracket', 'INFO'),
+        ('[notice] nothing to see', 'UNKNOWN'),
+        ('plain line', 'UNKNOWN')
+    ])
+    def test_level_falls_back_to_regex(self, log_collector, line, level):
+        """Test lines whose first bracket isn't a level token, or that have no brackets at all."""
+        assert log_collector.extract_log_level(line) == level
+    
+    @pytest.mark.parametrize("level", ['ERROR', 'WARNING', 'INFO', 'DEBUG', 'UNKNOWN'])
+    def test_level_filter_matches_window_after_wraparound(self, log_collector, level):
+        """Test that level-filtered results only contain entries still in the main window."""
+        lines = ['[INFO] a{}', '[ERROR] b{}', 'plain c{}', '[WARN] d{}', '[DEBUG] e{}', '[INFO] f{}']
+        for i in range(20):
+            log_collector.add_log_entry('/var/log/app.log', lines[i % len(lines)].format(i))
+        
+        window = log_collector.get_recent_logs(limit=None)
+        expected = [log for log in window if log['level'] == level]
+        
+        assert len(window) == 7
+        assert log_collector.get_recent_logs(limit=None, level_filter=level) == expected
+        assert log_collector.get_recent_logs(limit=1, level_filter=level.lower()) == expected[-1:]
+    
+    def test_timestamp_prefix_cached_per_second(self, log_collector, app_module):
+        """Test that timestamps match ISO format and the date part is formatted once per second."""
+        moments = [1705312801.25, 1705312801.5, 1705312802.0]
+        with patch.object(app_module.time, 'time', side_effect=moments), \
+             patch.object(app_module.time, 'strftime', wraps=time.strftime) as mock_strftime:
+            stamps = [log_collector.current_timestamp() for _ in moments]
+        
+        assert stamps == [datetime.fromtimestamp(m).isoformat(timespec='microseconds') for m in moments]
+        assert mock_strftime.call_count == 2
+    
+    def test_level_views_stay_within_capacity(self, log_collector):
+        """Test that the per-level views never hold more entries than the main buffer."""
+        for i in range(50):
+            log_collector.add_log_entry('/var/log/app.log', f'[ERROR] e{i}' if i % 3 else f'line {i}')
+        
+        assert sum(len(entries) for entries in log_collector._by_level.values()) == 7
+        assert log_collector.get_log_stats()['total_entries'] == 50
+    
+    def test_unknown_level_filter(self, log_collector):
+        """Test that a filter naming no known level returns nothing."""
+        log_collector.add_log_entry('/var/log/app.log', '[ERROR] boom')
+        
+        assert log_collector.get_recent_logs(level_filter='NOTICE') == []
+
+
+class TestLogFileHandler:
+    """Test suite for incremental log file reading."""
+    
+    @pytest.fixture
+    def handler(self, app_module):
+        """Provide a LogFileHandler feeding a fresh LogCollector, closed afterwards."""
+        handler = app_module.LogFileHandler(app_module.LogCollector(max_entries=50))
+        yield handler
+        handler.close()
+    
+    @pytest.fixture
+    def log_file(self, tmp_path):
+        """Provide the path of a log file with two lines already written."""
+        path = tmp_path / 'app.log'
+        path.write_text('[INFO] first\n[ERROR] second\n')
+        return str(path)
+    
+    @staticmethod
+    def _messages(handler):
+        return [log['message'] for log in handler.log_collector.get_recent_logs(limit=None)]
+    
+    def test_reads_only_appended_lines(self, handler, log_file):
+        """Test that each pass reads just the lines appended since the previous one."""
+        handler.process_log_file(log_file)
+        with open(log_file, 'a') as f:
+            f.write('[WARN] third\n')
+        handler.process_log_file(log_file)
+        
+        assert self._messages(handler) == ['[INFO] first', '[ERROR] second', '[WARN] third']
+    
+    def test_unterminated_line_is_carried_to_next_read(self, handler, log_file):
+        """Test that a line without its newline yet is held back and completed by the next write."""
+        handler.process_log_file(log_file)
+        with open(log_file, 'a') as f:
+            f.write('[WARN] par')
+        handler.process_log_file(log_file)
+        assert self._messages(handler)[-1] == '[ERROR] second'
+        
+        with open(log_file, 'a') as f:
+            f.write('tial\n[INFO] next\n')
+        handler.process_log_file(log_file)
+        
+        assert self._messages(handler)[-2:] == ['[WARN] partial', '[INFO] next']
+        assert log_file not in handler.partial_lines
+    
+    def test_lines_split_across_read_buffers(self, app_module, tmp_path):
+        """Test that lines longer than the read buffer, and CRLF endings split between reads, stay intact."""
+        with patch.object(app_module.LogFileHandler, 'READ_BUFFER_SIZE', 8):
+            handler = app_module.LogFileHandler(app_module.LogCollector(max_entries=50))
+        data = b'[INFO] abcdefgh\r\n[INFO] a long first line\r\n[ERROR] x\r\n\r\n[DEBUG] last\n'
+        # The first CRLF straddles the second read boundary: b'bcdefgh\r' | b'\n[INFO] '
+        assert data[15:17] == b'\r\n'
+        path = tmp_path / 'crlf.log'
+        path.write_bytes(data)
+        try:
+            handler.process_log_file(str(path))
+        finally:
+            handler.close()
+        
+        assert self._messages(handler) == [
+            '[INFO] abcdefgh', '[INFO] a long first line', '[ERROR] x', '[DEBUG] last'
+        ]
+    
+    def test_rotated_file_is_read_from_the_top(self, handler, log_file):
+        """Test that a file replaced under the same name is reopened and read from the start."""
+        handler.process_log_file(log_file)
+        old_handle = handler.file_handles[log_file]
+        os.rename(log_file, log_file + '.1')
+        with open(log_file, 'w') as f:
+            f.write('[INFO] rotated\n')
+        handler.process_log_file(log_file)
+        
+        assert old_handle.closed
+        assert self._messages(handler)[-1] == '[INFO] rotated'
+    
+    def test_truncated_file_is_read_from_the_top(self, handler, log_file):
+        """Test that a file truncated in place is read again from the start."""
+        handler.process_log_file(log_file)
+        with open(log_file, 'w') as f:
+            f.write('[DEBUG] new\n')
+        handler.process_log_file(log_file)
+        
+        assert self._messages(handler)[-1] == '[DEBUG] new'
+    
+    def test_reopen_per_read_mode(self, handler, log_file):
+        """Test the Windows mode: no handle is held between reads, yet reads resume and rotation is seen."""
+        handler.KEEP_FILES_OPEN = False
+        handler.process_log_file(log_file)
+        assert handler.file_handles == {}
+        
+        with open(log_file, 'a') as f:
+            f.write('[WARN] third\n[INFO] par')
+        handler.process_log_file(log_file)
+        assert self._messages(handler) == ['[INFO] first', '[ERROR] second', '[WARN] third']
+        
+        with open(log_file, 'a') as f:
+            f.write('tial\n')
+        handler.process_log_file(log_file)
+        assert self._messages(handler)[-1] == '[INFO] partial'
+        
+        with open(log_file, 'w') as f:
+            f.write('[DEBUG] truncated\n')
+        handler.process_log_file(log_file)
+        assert self._messages(handler)[-1] == '[DEBUG] truncated'
+        
+        os.rename(log_file, log_file + '.1')
+        with open(log_file, 'w') as f:
+            f.write('[INFO] rotated but longer than before\n')
+        handler.process_log_file(log_file)
+        assert self._messages(handler)[-1] == '[INFO] rotated but longer than before'
+        assert handler.file_handles == {}
+        
+        os.remove(log_file)
+        handler.process_log_file(log_file)
+        assert log_file not in handler.file_positions
+    
+    def test_deleted_file_releases_handle(self, handler, log_file):
+        """Test that processing a deleted file closes and drops its handle."""
+        handler.process_log_file(log_file)
+        old_handle = handler.file_handles[log_file]
+        os.remove(log_file)
+        handler.process_log_file(log_file)
+        
+        assert old_handle.closed
+        assert log_file not in handler.file_handles
+    
+    @pytest.mark.parametrize("make_event", [
+        lambda path: FileDeletedEvent(path),
+        lambda path: FileMovedEvent(path, path + '.1')
+    ], ids=['deleted', 'moved'])
+    def test_delete_and_move_events_release_handle(self, handler, log_file, make_event):
+        """Test that delete and move events close the handle and drop the partial line."""
+        with open(log_file, 'a') as f:
+            f.write('[INFO] unterminated')
+        handler.watched_paths.add(log_file)
+        handler.process_log_file(log_file)
+        old_handle = handler.file_handles[log_file]
+        
+        handler.dispatch(make_event(log_file))
+        
+        assert old_handle.closed
+        assert log_file not in handler.file_handles
+        assert log_file not in handler.partial_lines
+        assert log_file not in handler.watched_paths
+
+
 class TestErrorHandling:
     """Test suite for error handling scenarios."""
     
-    @patch('app.collect_system_metrics')
-    def test_metrics_endpoint_handles_collection_error(self, mock_collect, client):
+    def test_metrics_endpoint_handles_collection_error(self, client, collector):
         """Test metrics endpoint handles collection errors."""
-        mock_collect.side_effect = Exception("System error")
-        
-        response = client.get('/metrics')
-        assert response.status_code == 500
-        
-        data = json.loads(response.data)
-        assert 'error' in data
+        with patch.object(collector.metrics_collector, 'get_metrics_history',
+                          side_effect=Exception("System error")):
+            _assert_500_error(client.get('/metrics'))
     
-    @patch('app.get_recent_logs')
-    def test_logs_endpoint_handles_read_error(self, mock_get_logs, client):
+    def test_logs_endpoint_handles_read_error(self, client, collector):
         """Test logs endpoint handles read errors."""
-        mock_get_logs.side_effect = Exception("File read error")
-        
-        response = client.get('/logs')
-        assert response.status_code == 500
-        
-        data = json.loads(response.data)
-        assert 'error' in data
+        with patch.object(collector.log_collector, 'get_recent_logs',
+                          side_effect=Exception("File read error")):
+            _assert_500_error(client.get('/logs'))
     
     def test_invalid_endpoint(self, client):
         """Test request to invalid endpoint."""
@@ -394,24 +760,86 @@ class TestConfigurationHandling:
     """Test suite for configuration handling."""
     
     @patch('os.path.exists')
-    @patch('builtins.open', new_callable=mock_open)
-    def test_config_loading_with_valid_file(self, mock_file, mock_exists):
-        """Test configuration loading with valid config file."""
+    @patch('builtins.open', new_callable=mock_open,
+           read_data='{"api": {"port": 5001}, "logging": {"max_entries": 100}}')
+    def test_config_loading_with_valid_file(self, mock_file, mock_exists, app_module):
+        """Test that values from the config file override the defaults section by section."""
         mock_exists.return_value = True
-        mock_config = '{"api": {"port": 5000}, "logging": {"max_entries": 100}}'
-        mock_file.return_value.read.return_value = mock_config
         
-        # This would test your config loading if implemented
-        # For now, just verify the mocking works
-        assert mock_exists.return_value is True
+        config = app_module.load_config('config.json')
+        assert config['api']['port'] == 5001
+        assert config['api']['host'] == '0.0.0.0'
+        assert config['logging']['max_entries'] == 100
+        assert config['logging']['directories'] == ['logs']
     
     @patch('os.path.exists')
-    def test_config_loading_with_missing_file(self, mock_exists):
+    def test_config_loading_with_missing_file(self, mock_exists, app_module):
         """Test configuration loading with missing config file."""
         mock_exists.return_value = False
         
-        # Should use default configuration
-        assert mock_exists.return_value is False
+        config = app_module.load_config('missing.json')
+        assert config['api']['port'] == 5000
+        assert config['metrics']['collection_interval'] == 10
+
+
+class TestJsonProvider:
+    """Test suite for the orjson-backed JSON provider."""
+    
+    def test_provider_is_installed(self, flask_app, app_module):
+        """Test that the collector's app serializes through ORJSONProvider."""
+        assert isinstance(flask_app.json, app_module.ORJSONProvider)
+    
+    def test_dumps_and_loads_round_trip(self, flask_app):
+        """Test that dumps sorts keys, keeps non-ASCII text and round-trips through loads."""
+        obj = {'b': 1, 'a': [1.5, None, 'café'], 'c': {'z': True, 'y': False}}
+        text = flask_app.json.dumps(obj)
+        
+        assert text == '{"a":[1.5,null,"café"],"b":1,"c":{"y":false,"z":true}}'
+        assert flask_app.json.loads(text) == obj
+        assert flask_app.json.loads(text.encode('utf-8')) == obj
+    
+    def test_responses_are_sorted_json(self, client):
+        """Test that endpoint responses are JSON with keys in sorted order, like Flask's default."""
+        response = client.get('/status')
+        
+        assert response.mimetype == 'application/json'
+        data = json.loads(response.data)
+        assert list(data) == sorted(data)
+        assert list(data['components']) == sorted(data['components'])
+
+
+class TestApiServerSelection:
+    """Test suite for choosing the WSGI server that runs the API."""
+    
+    @pytest.fixture
+    def servers(self, collector):
+        """Patch out both servers so run_api_server returns immediately."""
+        with patch('app.serve') as mock_serve, \
+             patch.object(collector.app, 'run') as mock_run, \
+             patch.dict(collector.config['api']):
+            yield SimpleNamespace(waitress=mock_serve, werkzeug=mock_run)
+    
+    @pytest.mark.parametrize("server, debug, expected", [
+        ('waitress', False, 'waitress'),
+        ('waitress', True, 'werkzeug'),
+        ('werkzeug', False, 'werkzeug')
+    ])
+    def test_configured_server_is_used(self, collector, servers, server, debug, expected):
+        """Test that waitress serves the API unless werkzeug or debug mode is configured."""
+        collector.config['api'].update(server=server, debug=debug)
+        collector.run_api_server()
+        
+        assert getattr(servers, expected).called
+        assert not getattr(servers, 'werkzeug' if expected == 'waitress' else 'waitress').called
+    
+    def test_unknown_server_rejected(self, collector, servers):
+        """Test that an unsupported server name fails instead of falling back to werkzeug."""
+        collector.config['api']['server'] = 'gunicorn'
+        
+        with pytest.raises(ValueError, match='gunicorn'):
+            collector.run_api_server()
+        assert not servers.waitress.called
+        assert not servers.werkzeug.called
 
 
 class TestIntegrationScenarios:
@@ -420,52 +848,33 @@ class TestIntegrationScenarios:
     def test_application_startup(self, client):
         """Test that application starts and responds to basic requests."""
         # Test all endpoints are accessible
-        endpoints = ['/health', '/metrics', '/logs']
+        endpoints = ['/', '/health', '/metrics', '/logs', '/logs/stats', '/status', '/config']
         
         for endpoint in endpoints:
             response = client.get(endpoint)
-            assert response.status_code in [200, 500]  # 500 acceptable if system calls fail in test env
+            assert response.status_code == 200, endpoint
     
     def test_concurrent_requests(self, client):
         """Test handling of concurrent requests."""
-        import threading
-        import queue
-        
-        results = queue.Queue()
+        from concurrent.futures import ThreadPoolExecutor
         
-        def make_request():
-            response = client.get('/health')
-            results.put(response.status_code)
-        
-        # Create multiple threads
-        threads = []
-        for _ in range(5):
-            thread = threading.Thread(target=make_request)
-            threads.append(thread)
-            thread.start()
-        
-        # Wait for all threads
-        for thread in threads:
-            thread.join()
+        with ThreadPoolExecutor(max_workers=5) as executor:
+            response_codes = list(executor.map(
+                lambda _: client.get('/health').status_code, range(5)
+            ))
         
         # Check all requests succeeded
-        response_codes = []
-        while not results.empty():
-            response_codes.append(results.get())
-        
-        assert len(response_codes) == 5
-        assert all(code == 200 for code in response_codes)
+        assert response_codes == [200] * 5
     
-    @patch('time.sleep')
-    def test_metrics_collection_timing(self, mock_sleep, client):
+    def test_metrics_collection_timing(self, client):
         """Test metrics collection doesn't take too long."""
-        start_time = time.time()
-        response = client.get('/metrics')
-        end_time = time.time()
+        start = time.perf_counter_ns()
+        response = client.get('/metrics?current=true')
+        elapsed_ns = time.perf_counter_ns() - start
         
         assert response.status_code == 200
         # Should complete within reasonable time (2 seconds max)
-        assert end_time - start_time < 2.0
+        assert elapsed_ns < 2_000_000_000
 
 
 class TestDataValidation:
@@ -473,44 +882,45 @@ class TestDataValidation:
     
     def test_metrics_data_consistency(self, client):
         """Test that metrics data is consistent across calls."""
-        response1 = client.get('/metrics')
-        response2 = client.get('/metrics')
+        response1 = client.get('/metrics?current=true')
+        response2 = client.get('/metrics?current=true')
         
-        data1 = json.loads(response1.data)
-        data2 = json.loads(response2.data)
+        sample1 = response1.get_json()['metrics'][0]
+        sample2 = response2.get_json()['metrics'][0]
         
         # Structure should be identical
-        assert set(data1.keys()) == set(data2.keys())
-        assert set(data1['memory'].keys()) == set(data2['memory'].keys())
-        assert set(data1['disk_io'].keys()) == set(data2['disk_io'].keys())
+        assert set(sample1.keys()) == set(sample2.keys())
+        assert set(sample1['memory'].keys()) == set(sample2['memory'].keys())
+        assert set(sample1['network'].keys()) == set(sample2['network'].keys())
     
-    def test_timestamp_format(self, client):
+    def test_timestamp_format(self, metrics_response):
         """Test that timestamps are in correct format."""
-        response = client.get('/metrics')
-        data = json.loads(response.data)
+        timestamp = metrics_response[1]['metrics'][0]['timestamp']
         
-        timestamp = data['timestamp']
         # Should be ISO format string
         assert isinstance(timestamp, str)
         assert 'T' in timestamp  # ISO format contains T
     
-    def test_numeric_data_types(self, client):
+    def test_numeric_data_types(self, metrics_response):
         """Test that all numeric data are proper numbers."""
-        response = client.get('/metrics')
-        data = json.loads(response.data)
+        sample = metrics_response[1]['metrics'][0]
         
         # CPU should be numeric
-        assert isinstance(data['cpu_percent'], (int, float))
+        assert isinstance(sample['cpu']['percent'], (int, float))
         
-        # Memory values should be numeric
-        for key, value in data['memory'].items():
-            assert isinstance(value, (int, float)), f"Memory {key} is not numeric: {value}"
+        # Memory and disk values should be numeric
+        for section in ('memory', 'disk'):
+            for key, value in sample[section].items():
+                assert isinstance(value, (int, float)), f"{section} {key} is not numeric: {value}"
         
-        # Disk I/O values should be numeric
-        for key, value in data['disk_io'].items():
-            assert isinstance(value, (int, float)), f"Disk I/O {key} is not numeric: {value}"
+        # Network counters should be integers
+        for key, value in sample['network'].items():
+            assert isinstance(value, int), f"Network {key} is not an integer: {value}"
 
 
 if __name__ == '__main__':
-    # Run tests with coverage if this file is executed directly
-    pytest.main(['-v', '--cov=app', '--cov-report=html', '--cov-report=term-missing'])
\ No newline at end of file
+    # Run tests if this file is executed directly; set COV=1 to also collect coverage
+    args = ['-v']
+    if os.environ.get('COV'):
+        args += ['--cov=app', '--cov-report=html', '--cov-report=term-missing']
+    pytest.main(args)
\ No newline at end of file